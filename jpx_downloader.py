@@ -7,12 +7,20 @@ This script automatically downloads:
 2. Settlement Rates for Interest Rate Swap(Daily) (PDF)
 
 Files are saved to separate folders with appropriate naming.
+Each download is described by an entry in SOURCES; all entries run
+concurrently on one asyncio event loop sharing a single aiohttp session.
 """
 
-import os
+import re
+import asyncio
 import datetime
-import requests
+import email.utils
+import aiohttp
+import lxml.html
 from bs4 import BeautifulSoup
+from collections import namedtuple
+from pathlib import Path
+from urllib.parse import urljoin
 import logging
 
 # Configure logging
@@ -25,172 +33,178 @@ logging.basicConfig(
     ]
 )
 
-def get_derivatives_csv_link():
+BASE_URL = "https://www.jpx.co.jp"
+
+# Matches hrefs ending in .csv, with or without a query string.
+CSV_HREF = re.compile(r'\.csv(\?|$)', re.I)
+
+UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+HEADERS = {'User-Agent': UA}
+
+# Retry policy for transient failures: 3 retries backing off 0.5s, 1s, 2s.
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (500, 502, 503, 504)
+
+def _find_derivatives_csv(body):
     """
-    Scrape the JPX website to find the latest derivatives settlement price CSV link.
+    Pick the latest settlement price CSV link on the derivatives page.
     """
-    url = "https://www.jpx.co.jp/english/markets/derivatives/settlement-price/index.html"
-    
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        csv_links = soup.find_all('a', href=lambda href: href and '.csv' in href.lower())
-        
-        if not csv_links:
-            logging.error("No CSV links found on the derivatives settlement page.")
-            return None
-        
-        csv_url = csv_links[0]['href']
-        
-        if not csv_url.startswith('http'):
-            base_url = "https://www.jpx.co.jp"
-            csv_url = base_url + csv_url if csv_url.startswith('/') else base_url + '/' + csv_url
-            
-        logging.info(f"Found derivatives CSV link: {csv_url}")
-        return csv_url
-        
-    except Exception as e:
-        logging.error(f"Error finding derivatives CSV link: {str(e)}")
-        return None
+    soup = BeautifulSoup(body, 'lxml')
+    csv_links = soup.find_all('a', href=CSV_HREF)
+    return csv_links[0]['href'] if csv_links else None
+
+def _find_irs_settlement_pdf(body):
+    """
+    Pick the Settlement Rates for Interest Rate Swap(Daily) PDF link.
+
+    First PDF link following the element that carries the section
+    heading, found in a single compiled libxml2 traversal.
+    """
+    tree = lxml.html.fromstring(body)
+    hrefs = tree.xpath(
+        "(//*[contains(normalize-space(.), 'Settlement Rates for Interest Rate Swap(Daily)')]"
+        "/following::a[contains(translate(@href, 'PDF', 'pdf'), '.pdf')])[1]/@href"
+    )
+    return hrefs[0] if hrefs else None
+
+# One entry per file to fetch: which page to scrape, how to pick the
+# link out of it, and where/how to save the result.
+Source = namedtuple('Source', 'name page find_link out_dir prefix ext label')
+
+SOURCES = [
+    Source(name='derivatives',
+           page='https://www.jpx.co.jp/english/markets/derivatives/settlement-price/index.html',
+           find_link=_find_derivatives_csv,
+           out_dir='jpx_data',
+           prefix='jpx_settlement_prices',
+           ext='csv',
+           label='derivatives CSV'),
+    Source(name='irs_settlement',
+           page='https://www.jpx.co.jp/jscc/en/interest_rate_swap.html',
+           find_link=_find_irs_settlement_pdf,
+           out_dir='jpx_data',
+           prefix='irs_settlement_rates',
+           ext='pdf',
+           label='Settlement Rates for Interest Rate Swap(Daily) PDF'),
+]
+
+async def _get(session, url, **kwargs):
+    """
+    GET with bounded retry: connection errors and transient 5xx
+    responses are retried with exponential backoff before giving up.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(BACKOFF_FACTOR * (2 ** (attempt - 1)))
+        try:
+            response = await session.get(url, **kwargs)
+        except aiohttp.ClientConnectionError as e:
+            if attempt == MAX_RETRIES:
+                raise
+            logging.warning(f"Connection error for {url} ({e}), retrying")
+            continue
+        if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+            logging.warning(f"Got HTTP {response.status} for {url}, retrying")
+            response.release()
+            continue
+        return response
 
-def get_irs_settlement_rates_link():
+def _abs(url):
     """
-    Scrape the JPX website to find the Settlement Rates for Interest Rate Swap(Daily) PDF link.
+    Resolve a possibly-relative JPX link against the site root.
+    """
+    return urljoin(BASE_URL, url)
+
+async def get_link(session, src):
+    """
+    Scrape the source's page and return the absolute URL of its file.
     """
-    url = "https://www.jpx.co.jp/jscc/en/interest_rate_swap.html"
-    
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the Settlement Rates section by its header
-        settlement_rates_link = None
-        
-        # Look for headers containing the specific text
-        headers = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'div', 'p'])
-        
-        for header in headers:
-            header_text = header.get_text().strip()
-            
-            # Settlement Rates for Interest Rate Swap(Daily)
-            if "Settlement Rates for Interest Rate Swap(Daily)" in header_text:
-                # Look for the nearest PDF link after this header
-                next_element = header
-                while next_element and not settlement_rates_link:
-                    next_element = next_element.next_element
-                    if next_element and hasattr(next_element, 'name') and next_element.name == 'a':
-                        href = next_element.get('href', '')
-                        if '.pdf' in href.lower():
-                            settlement_rates_link = next_element['href']
-                            break
-        
-        # Convert to absolute URL if needed
-        if settlement_rates_link and not settlement_rates_link.startswith('http'):
-            base_url = "https://www.jpx.co.jp"
-            settlement_rates_link = base_url + settlement_rates_link if settlement_rates_link.startswith('/') else base_url + '/' + settlement_rates_link
-        
-        logging.info(f"Found Settlement Rates IRS PDF link: {settlement_rates_link}")
-        return settlement_rates_link
-        
+        async with await _get(session, src.page) as response:
+            response.raise_for_status()
+            body = await response.read()
+
+        href = src.find_link(body)
+
+        if not href:
+            logging.error(f"No {src.label} link found on {src.page}")
+            return None
+
+        url = _abs(href)
+
+        logging.info(f"Found {src.label} link: {url}")
+        return url
+
     except Exception as e:
-        logging.error(f"Error finding Settlement Rates IRS PDF link: {str(e)}")
+        logging.error(f"Error finding {src.label} link: {str(e)}")
         return None
 
-def download_derivatives_csv(csv_url, download_dir="jpx_data"):
+async def _download(session, url, today, download_dir, prefix, ext, label):
     """
-    Download the derivatives settlement price CSV file from the provided URL.
+    Download one file to download_dir as {prefix}_{today}.{ext},
+    streaming the body to disk in chunks.
+
+    If the file already exists locally, the request carries an
+    If-Modified-Since header so an unchanged file on JPX's side
+    answers 304 and no body is transferred.
     """
-    if not csv_url:
+    if not url:
         return False
-    
+
     try:
-        os.makedirs(download_dir, exist_ok=True)
-        
-        today = datetime.datetime.now().strftime("%Y%m%d")
-        filename = f"jpx_settlement_prices_{today}.csv"
-        filepath = os.path.join(download_dir, filename)
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        logging.info(f"Downloading derivatives CSV from {csv_url}")
-        response = requests.get(csv_url, headers=headers)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        logging.info(f"Successfully downloaded derivatives CSV to {filepath}")
+        filepath = Path(download_dir) / f"{prefix}_{today}.{ext}"
+
+        headers = {}
+        if filepath.exists():
+            headers['If-Modified-Since'] = email.utils.formatdate(
+                filepath.stat().st_mtime, usegmt=True)
+
+        logging.info(f"Downloading {label} from {url}")
+        async with await _get(session, url, headers=headers) as response:
+            if response.status == 304:
+                logging.info(f"{label} not modified since last download, keeping {filepath}")
+                return True
+            response.raise_for_status()
+            with open(filepath, 'wb') as f:
+                async for chunk in response.content.iter_chunked(1 << 20):
+                    f.write(chunk)
+
+        logging.info(f"Successfully downloaded {label} to {filepath}")
         return True
-        
+
     except Exception as e:
-        logging.error(f"Error downloading derivatives CSV: {str(e)}")
+        logging.error(f"Error downloading {label}: {str(e)}")
         return False
 
-def download_irs_settlement_rates_pdf(pdf_url, download_dir="jpx_data"):
+async def process(session, src, today):
     """
-    Download the Settlement Rates for Interest Rate Swap(Daily) PDF file.
+    Scrape one source's page and download the file it points to.
     """
-    if not pdf_url:
-        return False
-    
-    try:
-        os.makedirs(download_dir, exist_ok=True)
-        
-        today = datetime.datetime.now().strftime("%Y%m%d")
-        filename = f"irs_settlement_rates_{today}.pdf"
-        filepath = os.path.join(download_dir, filename)
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        logging.info(f"Downloading IRS Settlement Rates PDF from {pdf_url}")
-        response = requests.get(pdf_url, headers=headers)
-        response.raise_for_status()
-        
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
-        
-        logging.info(f"Successfully downloaded IRS Settlement Rates PDF to {filepath}")
-        return True
-        
-    except Exception as e:
-        logging.error(f"Error downloading IRS Settlement Rates PDF: {str(e)}")
-        return False
+    url = await get_link(session, src)
+    if url:
+        await _download(session, url, today, src.out_dir, src.prefix, src.ext, src.label)
+    else:
+        logging.error(f"Failed to get {src.label} link.")
 
-def main():
+async def main():
     """
     Main function to execute the file download process.
     """
     logging.info("Starting JPX File Downloader")
-    
-    # Download derivatives settlement prices CSV
-    derivatives_csv_url = get_derivatives_csv_link()
-    if derivatives_csv_url:
-        download_derivatives_csv(derivatives_csv_url)
-    else:
-        logging.error("Failed to get derivatives CSV link.")
-    
-    # Download Settlement Rates for Interest Rate Swap(Daily) PDF
-    irs_pdf_url = get_irs_settlement_rates_link()
-    if irs_pdf_url:
-        download_irs_settlement_rates_pdf(irs_pdf_url)
-    else:
-        logging.error("Failed to get Settlement Rates for Interest Rate Swap(Daily) PDF link.")
+
+    # Stamp every file from this run with the same date, computed once.
+    today = datetime.date.today().strftime("%Y%m%d")
+
+    # Create each output directory once up front instead of per download.
+    for out_dir in {src.out_dir for src in SOURCES}:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+
+    connector = aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=60, connect=5)
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS,
+                                     timeout=timeout) as session:
+        await asyncio.gather(*(process(session, src, today) for src in SOURCES))
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())